@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, HTTPException
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
@@ -11,7 +13,9 @@ from app.middleware.error_handler import (
     generic_exception_handler,
 )
 from app.models.ml_models import ModelManager
+from app.models.model_pool import ModelPool
 from app.services.prediction_service import PredictionService
+from app.services.job_service import JobService
 from app.routes.router import register_routes
 
 
@@ -29,12 +33,18 @@ def create_app() -> FastAPI:
     logger = get_logger(__name__)
     logger.info("Creating application: %s v%s", settings.APP_NAME, settings.VERSION)
 
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        app.state.job_service.shutdown()
+
     # --- FastAPI instance ---
     app = FastAPI(
         title=settings.APP_NAME,
         version=settings.VERSION,
         docs_url="/docs",
         redoc_url="/redoc",
+        lifespan=lifespan,
     )
 
     # --- CORS ---
@@ -55,13 +65,33 @@ def create_app() -> FastAPI:
     model_manager = ModelManager(settings.MODELS_DIR)
     model_manager.load_models()
 
+    # Per-site models are loaded lazily on first request
+    model_pool = ModelPool(
+        settings.SITE_MODELS_DIR,
+        default_manager=model_manager,
+        max_bytes=settings.MODEL_POOL_MAX_MB * 2**20,
+    )
+
     # --- Services ---
-    prediction_service = PredictionService(model_manager)
+    prediction_service = PredictionService(model_manager, model_pool)
+    # Batch jobs score in worker processes with their own copy of the models
+    job_service = JobService(
+        settings.JOBS_DIR,
+        settings.MODELS_DIR,
+        settings.SITE_MODELS_DIR,
+        model_pool_max_bytes=settings.MODEL_POOL_MAX_MB * 2**20,
+        max_workers=settings.JOB_WORKERS,
+        chunk_size=settings.JOB_CHUNK_SIZE,
+        threads_per_worker=settings.JOB_THREADS_PER_WORKER,
+        retention_hours=settings.JOB_RETENTION_HOURS,
+    )
 
     # --- Store in app state for dependency injection ---
     app.state.settings = settings
     app.state.model_manager = model_manager
+    app.state.model_pool = model_pool
     app.state.prediction_service = prediction_service
+    app.state.job_service = job_service
 
     # --- Routes ---
     register_routes(app)
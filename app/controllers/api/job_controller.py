@@ -0,0 +1,78 @@
+from typing import Optional
+
+from fastapi import APIRouter, File, Form, HTTPException, Query, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+
+from app.models.schemas import JobResponse, JobResultPage
+from app.services.job_service import JobNotFoundError, JobNotReadyError
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+def _job_service(request: Request):
+    return request.app.state.job_service
+
+
+@router.post("", response_model=JobResponse, status_code=202)
+async def submit_job(
+    request: Request,
+    file: UploadFile = File(..., description="CSV with the original dataset column names"),
+    site_id: Optional[str] = Form(default=None, description="Site whose model should score the rows"),
+) -> JobResponse:
+    """
+    Submit a CSV file for background scoring.
+
+    Returns immediately with a job id; poll the status endpoint for progress.
+    """
+    try:
+        # Copying a large upload to disk is blocking I/O — keep it off the event loop
+        return await run_in_threadpool(_job_service(request).submit, file.file, site_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str, request: Request) -> JobResponse:
+    """Get the status and progress of a job."""
+    try:
+        return _job_service(request).get(job_id)
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.post("/{job_id}/cancel", response_model=JobResponse)
+async def cancel_job(job_id: str, request: Request) -> JobResponse:
+    """Cancel a queued or running job."""
+    try:
+        return _job_service(request).cancel(job_id)
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/{job_id}/result")
+async def download_job_result(job_id: str, request: Request) -> FileResponse:
+    """Stream the full result of a completed job as CSV."""
+    try:
+        path = _job_service(request).result_path(job_id)
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except JobNotReadyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return FileResponse(path, media_type="text/csv", filename=f"{job_id}.csv")
+
+
+@router.get("/{job_id}/result/page", response_model=JobResultPage)
+async def get_job_result_page(
+    job_id: str,
+    request: Request,
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=1000, ge=1, le=10000),
+) -> JobResultPage:
+    """Get a page of results of a completed job as JSON."""
+    try:
+        return await run_in_threadpool(_job_service(request).result_page, job_id, offset, limit)
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except JobNotReadyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
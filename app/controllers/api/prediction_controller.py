@@ -1,19 +1,48 @@
-from fastapi import APIRouter, Request, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Request, HTTPException, Header
+from fastapi.concurrency import run_in_threadpool
+from app.models.model_pool import InvalidSiteError
 from app.models.schemas import MachineData, PredictionResponse
 
 router = APIRouter(tags=["Predictions"])
 
 
+async def _predict(request: Request, data: MachineData, site_id: Optional[str]) -> PredictionResponse:
+    try:
+        prediction_service = request.app.state.prediction_service
+        # A cold site loads its artifacts from disk — keep that off the event loop
+        return await run_in_threadpool(prediction_service.predict, data, site_id=site_id)
+    except InvalidSiteError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/predict/xgboost", response_model=PredictionResponse)
-async def predict_xgboost(data: MachineData, request: Request) -> PredictionResponse:
+async def predict_xgboost(
+    data: MachineData,
+    request: Request,
+    x_site_id: Optional[str] = Header(default=None, description="Site whose model should serve the request"),
+) -> PredictionResponse:
     """
     Predict machine failure using the XGBoost model.
 
     Accepts sensor data, applies feature engineering and preprocessing,
-    then returns the failure prediction and probability.
+    then returns the failure prediction and probability. An optional
+    ``X-Site-ID`` header routes the request to that site's model.
     """
-    try:
-        prediction_service = request.app.state.prediction_service
-        return prediction_service.predict(data)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await _predict(request, data, x_site_id)
+
+
+@router.post("/sites/{site_id}/predict/xgboost", response_model=PredictionResponse)
+async def predict_xgboost_for_site(
+    site_id: str, data: MachineData, request: Request
+) -> PredictionResponse:
+    """
+    Predict machine failure using the model of a specific site.
+
+    Sites without dedicated artifacts are served by the default model
+    with their per-site threshold, if one is configured.
+    """
+    return await _predict(request, data, site_id)
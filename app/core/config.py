@@ -16,6 +16,19 @@ class Settings(BaseSettings):
     # Paths
     BASE_DIR: str = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     MODELS_DIR: str = ""
+    SITE_MODELS_DIR: str = ""
+    JOBS_DIR: str = ""
+
+    # Per-site model pool — budget is the on-disk size of site artifacts
+    # (default model excluded), used as an estimate of their memory footprint.
+    # Applies to the API process and to each job worker process separately.
+    MODEL_POOL_MAX_MB: int = 512
+
+    # Background scoring jobs (run in JOB_WORKERS separate processes)
+    JOB_WORKERS: int = 2
+    JOB_CHUNK_SIZE: int = 10000
+    JOB_THREADS_PER_WORKER: int = 1
+    JOB_RETENTION_HOURS: int = 72  # finished jobs are deleted after this; 0 keeps them
 
     class Config:
         env_file = ".env"
@@ -26,6 +39,10 @@ class Settings(BaseSettings):
         super().__init__(**kwargs)
         if not self.MODELS_DIR:
             self.MODELS_DIR = os.path.join(self.BASE_DIR, "Models")
+        if not self.SITE_MODELS_DIR:
+            self.SITE_MODELS_DIR = os.path.join(self.MODELS_DIR, "sites")
+        if not self.JOBS_DIR:
+            self.JOBS_DIR = os.path.join(self.BASE_DIR, "Jobs")
 
 
 @lru_cache()
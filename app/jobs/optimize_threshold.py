@@ -0,0 +1,237 @@
+"""
+Offline threshold optimization and calibration job.
+
+Scores a labeled export in one batched pass, optionally fits a probability
+calibrator, sweeps every candidate threshold with vectorized prefix sums and
+writes the chosen global and per-site thresholds into the model metadata
+that ``ModelManager`` loads at startup.
+
+Run with:
+    python -m app.jobs.optimize_threshold --data Data/ai4i2020.csv \\
+        --calibration isotonic --holdout 0.3 --site plant-a:1:25 --site plant-b:5:10
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from app.core.config import get_settings
+from app.core.logging import setup_logging, get_logger
+from app.models.ml_models import ModelManager, PREPROCESSOR_FILENAME
+from app.models.schemas import ModelMetadata
+from app.services.calibration_service import (
+    ProbabilityCalibrator,
+    ThresholdCurve,
+    compute_threshold_curve,
+    select_threshold,
+)
+from app.services.prediction_service import PredictionService
+
+logger = get_logger(__name__)
+
+DEFAULT_LABEL_COLUMN = "Machine failure"
+
+
+def parse_site_cost(value: str) -> Tuple[str, float, float]:
+    """Parse a ``SITE:FP_COST:FN_COST`` command-line value."""
+    parts = value.rsplit(":", 2)
+    if len(parts) != 3 or not parts[0]:
+        raise argparse.ArgumentTypeError(
+            f"Invalid site cost {value!r}, expected SITE:FP_COST:FN_COST"
+        )
+    try:
+        return parts[0], float(parts[1]), float(parts[2])
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Costs must be numbers in {value!r}")
+
+
+def _describe(curve: ThresholdCurve, idx: int) -> str:
+    return (
+        f"threshold={curve.thresholds[idx]:.4f} precision={curve.precision[idx]:.3f} "
+        f"recall={curve.recall[idx]:.3f} f1={curve.f1[idx]:.3f} "
+        f"FP={int(curve.fp[idx])} FN={int(curve.fn[idx])}"
+    )
+
+
+def optimize_thresholds(
+    prediction_service: PredictionService,
+    df: pd.DataFrame,
+    label_column: str = DEFAULT_LABEL_COLUMN,
+    calibration: Optional[str] = None,
+    fp_cost: Optional[float] = None,
+    fn_cost: Optional[float] = None,
+    site_costs: Optional[List[Tuple[str, float, float]]] = None,
+    holdout: Optional[float] = None,
+    random_state: int = 42,
+) -> Tuple[ModelMetadata, Optional[ProbabilityCalibrator]]:
+    """
+    Derive global and per-site thresholds from a labeled DataFrame.
+
+    The dataset is scored and swept exactly once; every site selection is a
+    single argmin over the shared cost curve. With ``holdout``, the
+    calibrator is fitted on a stratified split and thresholds are swept on
+    the held-out ``holdout`` fraction only.
+    """
+    if label_column not in df.columns:
+        raise ValueError(f"Label column {label_column!r} not found in dataset")
+    y_true = df[label_column].to_numpy(dtype=int)
+
+    logger.info("Scoring %d rows", len(df))
+    scores = prediction_service.predict_proba_batch(df, calibrated=False)
+
+    calibrator = None
+    if calibration:
+        if holdout:
+            calib_idx, sweep_idx = train_test_split(
+                np.arange(y_true.size),
+                test_size=holdout,
+                stratify=y_true,
+                random_state=random_state,
+            )
+            logger.info(
+                "Fitting %s calibrator on %d rows, sweeping on %d held-out rows",
+                calibration,
+                calib_idx.size,
+                sweep_idx.size,
+            )
+            calibrator = ProbabilityCalibrator(calibration).fit(scores[calib_idx], y_true[calib_idx])
+            scores, y_true = scores[sweep_idx], y_true[sweep_idx]
+        else:
+            logger.warning(
+                "Calibrator and thresholds are fitted on the same rows — "
+                "use --holdout to sweep thresholds on unseen data"
+            )
+            calibrator = ProbabilityCalibrator(calibration).fit(scores, y_true)
+        scores = calibrator.transform(scores)
+    elif holdout:
+        logger.info("No calibration requested — sweeping thresholds on all rows")
+
+    curve = compute_threshold_curve(y_true, scores)
+    logger.info(
+        "Swept %d candidate thresholds (%d positives / %d negatives)",
+        curve.thresholds.size,
+        curve.n_positive,
+        curve.n_negative,
+    )
+
+    best = select_threshold(curve, fp_cost, fn_cost)
+    objective = "f1" if fp_cost is None else f"cost(fp={fp_cost:g}, fn={fn_cost:g})"
+    logger.info("Global [%s]: %s", objective, _describe(curve, best))
+
+    site_thresholds: Dict[str, float] = {}
+    for site_id, site_fp_cost, site_fn_cost in site_costs or []:
+        idx = select_threshold(curve, site_fp_cost, site_fn_cost)
+        site_thresholds[site_id] = float(curve.thresholds[idx])
+        logger.info("Site %s: %s", site_id, _describe(curve, idx))
+
+    metadata = ModelMetadata(
+        threshold=float(curve.thresholds[best]),
+        site_thresholds=site_thresholds,
+        calibration_method=calibration,
+        objective=objective,
+        n_samples=int(len(df)),
+        generated_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    )
+    return metadata, calibrator
+
+
+def build_parser() -> argparse.ArgumentParser:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(
+        description="Re-derive the decision threshold(s) and calibration from labeled data."
+    )
+    parser.add_argument(
+        "--data",
+        default=os.path.join(settings.BASE_DIR, "Data", "ai4i2020.csv"),
+        help="Labeled CSV export with the original dataset columns",
+    )
+    parser.add_argument("--label-column", default=DEFAULT_LABEL_COLUMN)
+    parser.add_argument(
+        "--models-dir",
+        default=settings.MODELS_DIR,
+        help="Artifacts to optimize, e.g. a site directory under SITE_MODELS_DIR",
+    )
+    parser.add_argument(
+        "--calibration",
+        choices=["isotonic", "platt"],
+        default=None,
+        help="Fit a probability calibrator before sweeping thresholds",
+    )
+    parser.add_argument(
+        "--holdout",
+        type=float,
+        default=None,
+        help="Fraction of rows (stratified) held out from calibration for the threshold sweep",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the holdout split")
+    parser.add_argument("--fp-cost", type=float, default=None, help="Cost of a false alarm")
+    parser.add_argument("--fn-cost", type=float, default=None, help="Cost of a missed failure")
+    parser.add_argument(
+        "--site",
+        dest="sites",
+        action="append",
+        type=parse_site_cost,
+        default=[],
+        metavar="SITE:FP_COST:FN_COST",
+        help="Per-site costs; may be repeated",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report the selected thresholds without writing metadata",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if (args.fp_cost is None) != (args.fn_cost is None):
+        parser.error("--fp-cost and --fn-cost must be given together")
+    if args.holdout is not None and not 0.0 < args.holdout < 1.0:
+        parser.error("--holdout must be between 0 and 1")
+
+    setup_logging(get_settings().LOG_LEVEL)
+
+    # Site directories may reuse the default preprocessor, as in ModelPool
+    preprocessor = None
+    if not os.path.exists(os.path.join(args.models_dir, PREPROCESSOR_FILENAME)):
+        preprocessor = joblib.load(os.path.join(get_settings().MODELS_DIR, PREPROCESSOR_FILENAME))
+
+    model_manager = ModelManager(args.models_dir, preprocessor=preprocessor)
+    model_manager.load_models()
+    prediction_service = PredictionService(model_manager)
+
+    logger.info("Reading labeled data from %s", args.data)
+    df = pd.read_csv(args.data)
+
+    metadata, calibrator = optimize_thresholds(
+        prediction_service,
+        df,
+        label_column=args.label_column,
+        calibration=args.calibration,
+        fp_cost=args.fp_cost,
+        fn_cost=args.fn_cost,
+        site_costs=args.sites,
+        holdout=args.holdout,
+        random_state=args.seed,
+    )
+    metadata.dataset = os.path.basename(args.data)
+
+    if args.dry_run:
+        print(metadata.model_dump_json(indent=2))
+        return 0
+
+    model_manager.save_metadata(metadata, calibrator)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional
+
+from app.models.schemas import JobResponse
+
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id          TEXT PRIMARY KEY,
+    status          TEXT NOT NULL,
+    site_id         TEXT,
+    owner_pid       INTEGER NOT NULL,
+    total_rows      INTEGER NOT NULL,
+    processed_rows  INTEGER NOT NULL DEFAULT 0,
+    invalid_rows    INTEGER NOT NULL DEFAULT 0,
+    error           TEXT,
+    created_at      TEXT NOT NULL,
+    started_at      TEXT,
+    finished_at     TEXT
+)
+"""
+
+
+def _now() -> str:
+    return _timestamp(datetime.now(timezone.utc))
+
+
+def _timestamp(moment: datetime) -> str:
+    return moment.astimezone(timezone.utc).isoformat(timespec="seconds")
+
+
+class JobStore:
+    """
+    SQLite-backed persistence for background scoring job state.
+
+    Every call opens its own short-lived connection, so the store can be
+    shared between the request handlers and the worker threads.
+    """
+
+    def __init__(self, db_path: str):
+        self._db_path = db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self._db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def create(self, job_id: str, total_rows: int, site_id: Optional[str] = None) -> JobResponse:
+        """Register a new queued job, owned by the current process."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, status, site_id, owner_pid, total_rows, created_at) "
+                "VALUES (?, 'queued', ?, ?, ?, ?)",
+                (job_id, site_id, os.getpid(), total_rows, _now()),
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[JobResponse]:
+        """Fetch a job, or None if it does not exist."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return JobResponse(**dict(row)) if row else None
+
+    def get_status(self, job_id: str) -> Optional[str]:
+        """Cheap status lookup used by workers to notice cancellation."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT status FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return row["status"] if row else None
+
+    def mark_running(self, job_id: str) -> bool:
+        """Move a queued job to running. Returns False if it was cancelled meanwhile."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'running', started_at = ? "
+                "WHERE job_id = ? AND status = 'queued'",
+                (_now(), job_id),
+            )
+        return cursor.rowcount == 1
+
+    def update_progress(self, job_id: str, processed_rows: int, invalid_rows: int = 0) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET processed_rows = ?, invalid_rows = ? WHERE job_id = ?",
+                (processed_rows, invalid_rows, job_id),
+            )
+
+    def finish(
+        self,
+        job_id: str,
+        status: str,
+        error: Optional[str] = None,
+        total_rows: Optional[int] = None,
+    ) -> bool:
+        """
+        Move an unfinished job to a final status.
+
+        ``total_rows``, when given, replaces the estimate recorded at
+        submission. Returns False if the job had already finished (e.g. it
+        was cancelled while the worker was completing it).
+        """
+        if status not in FINISHED_STATUSES:
+            raise ValueError(f"Not a final job status: {status!r}")
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ?, "
+                "total_rows = COALESCE(?, total_rows) "
+                "WHERE job_id = ? AND status IN ('queued', 'running')",
+                (status, error, _now(), total_rows, job_id),
+            )
+        return cursor.rowcount == 1
+
+    def fail_orphaned(self, reason: str) -> List[str]:
+        """
+        Fail unfinished jobs whose owning process is gone. Returns their ids.
+
+        Meant to be called once at startup: jobs recorded under the current
+        pid belong to a previous incarnation (e.g. PID 1 in a restarted
+        container). Jobs owned by other live server workers are left alone.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT job_id, owner_pid FROM jobs WHERE status IN ('queued', 'running')"
+            ).fetchall()
+            orphaned = [
+                row["job_id"]
+                for row in rows
+                if row["owner_pid"] == os.getpid() or not _pid_alive(row["owner_pid"])
+            ]
+            conn.executemany(
+                "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? "
+                "WHERE job_id = ? AND status IN ('queued', 'running')",
+                [(reason, _now(), job_id) for job_id in orphaned],
+            )
+        return orphaned
+
+    def purge_finished(self, finished_before: datetime) -> List[str]:
+        """Delete jobs that finished before ``finished_before``. Returns their ids."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT job_id FROM jobs WHERE status IN ('completed', 'failed', 'cancelled') "
+                "AND finished_at < ?",
+                (_timestamp(finished_before),),
+            ).fetchall()
+            expired = [row["job_id"] for row in rows]
+            conn.executemany("DELETE FROM jobs WHERE job_id = ?", [(job_id,) for job_id in expired])
+        return expired
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name == "nt":
+        # os.kill would terminate the process on Windows — assume it is alive
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -1,9 +1,16 @@
 import os
 import joblib
+from typing import Optional
+
 from app.core.logging import get_logger
+from app.models.schemas import ModelMetadata
 
 logger = get_logger(__name__)
 
+PREPROCESSOR_FILENAME = "preprocessor.pkl"
+MODEL_FILENAME = "xgb_model.pkl"
+METADATA_FILENAME = "model_metadata.json"
+
 
 class ModelManager:
     """
@@ -13,25 +20,82 @@ class ModelManager:
     the application via dependency injection.
     """
 
-    def __init__(self, models_dir: str):
+    def __init__(self, models_dir: str, preprocessor=None, n_jobs: Optional[int] = None):
         self._models_dir = models_dir
-        self._preprocessor = None
+        self._preprocessor = preprocessor
+        self._n_jobs = n_jobs
         self._model = None
-        self._threshold: float = 0.8966
+        self._calibrator = None
+        self._metadata = ModelMetadata()
 
     def load_models(self) -> None:
-        """Load all ML artifacts from disk."""
-        preprocessor_path = os.path.join(self._models_dir, "preprocessor.pkl")
-        model_path = os.path.join(self._models_dir, "xgb_model.pkl")
+        """
+        Load all ML artifacts from disk.
 
-        logger.info("Loading preprocessor from %s", preprocessor_path)
-        self._preprocessor = joblib.load(preprocessor_path)
+        A preprocessor passed to the constructor is reused as-is, which lets
+        several managers share one pipeline instance. ``n_jobs``, when set,
+        overrides the number of threads the model uses for inference.
+        """
+        preprocessor_path = os.path.join(self._models_dir, PREPROCESSOR_FILENAME)
+        model_path = os.path.join(self._models_dir, MODEL_FILENAME)
+
+        if self._preprocessor is None:
+            logger.info("Loading preprocessor from %s", preprocessor_path)
+            self._preprocessor = joblib.load(preprocessor_path)
 
         logger.info("Loading XGBoost model from %s", model_path)
         self._model = joblib.load(model_path)
+        if self._n_jobs is not None:
+            self._model.set_params(n_jobs=self._n_jobs)
+
+        self._load_metadata()
 
         logger.info("All models loaded successfully")
 
+    def _load_metadata(self) -> None:
+        """Load the decision threshold(s) and optional calibrator, if present."""
+        metadata_path = os.path.join(self._models_dir, METADATA_FILENAME)
+        if not os.path.exists(metadata_path):
+            logger.info("No model metadata found — using default threshold %.4f", self.threshold)
+            return
+
+        logger.info("Loading model metadata from %s", metadata_path)
+        with open(metadata_path, "r", encoding="utf-8") as f:
+            self._metadata = ModelMetadata.model_validate_json(f.read())
+
+        if self._metadata.calibrator_file:
+            calibrator_path = os.path.join(self._models_dir, self._metadata.calibrator_file)
+            logger.info("Loading %s calibrator from %s", self._metadata.calibration_method, calibrator_path)
+            self._calibrator = joblib.load(calibrator_path)
+
+    def save_metadata(self, metadata: ModelMetadata, calibrator=None) -> str:
+        """
+        Persist decision metadata (and calibrator) next to the model artifacts.
+
+        Returns the path of the written metadata file. The new settings take
+        effect for this manager immediately and for the API on next startup.
+        """
+        if calibrator is not None:
+            metadata.calibrator_file = metadata.calibrator_file or "calibrator.pkl"
+            joblib.dump(calibrator, os.path.join(self._models_dir, metadata.calibrator_file))
+        else:
+            metadata.calibrator_file = None
+            metadata.calibration_method = None
+
+        metadata_path = os.path.join(self._models_dir, METADATA_FILENAME)
+        with open(metadata_path, "w", encoding="utf-8") as f:
+            f.write(metadata.model_dump_json(indent=2))
+
+        self._metadata = metadata
+        self._calibrator = calibrator
+        logger.info("Model metadata written to %s", metadata_path)
+        return metadata_path
+
+    @property
+    def models_dir(self) -> str:
+        """Directory the artifacts are loaded from."""
+        return self._models_dir
+
     @property
     def preprocessor(self):
         """Sklearn preprocessing pipeline."""
@@ -46,7 +110,23 @@ class ModelManager:
             raise RuntimeError("Models not loaded. Call load_models() first.")
         return self._model
 
+    @property
+    def calibrator(self):
+        """Fitted probability calibrator, or None when probabilities are used raw."""
+        return self._calibrator
+
+    @property
+    def metadata(self) -> ModelMetadata:
+        """Decision metadata loaded alongside the model."""
+        return self._metadata
+
     @property
     def threshold(self) -> float:
         """Tuned classification threshold."""
-        return self._threshold
+        return self._metadata.threshold
+
+    def threshold_for(self, site_id: Optional[str] = None) -> float:
+        """Classification threshold for a site, falling back to the global one."""
+        if site_id is None:
+            return self.threshold
+        return self._metadata.site_thresholds.get(site_id, self.threshold)
@@ -0,0 +1,204 @@
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import joblib
+
+from app.core.logging import get_logger
+from app.models.ml_models import (
+    ModelManager,
+    MODEL_FILENAME,
+    PREPROCESSOR_FILENAME,
+)
+
+logger = get_logger(__name__)
+
+SITE_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+
+
+class InvalidSiteError(ValueError):
+    """Raised when a site id is malformed."""
+
+
+def validate_site_id(site_id: str) -> str:
+    """Return ``site_id`` unchanged, or raise ``InvalidSiteError`` if malformed."""
+    if not SITE_ID_PATTERN.match(site_id):
+        raise InvalidSiteError(f"Invalid site id: {site_id!r}")
+    return site_id
+
+
+@dataclass
+class _PoolEntry:
+    manager: ModelManager
+    size_bytes: int
+    preprocessor_key: str
+
+
+@dataclass
+class _SharedPreprocessor:
+    preprocessor: object
+    size_bytes: int
+    refcount: int = 0
+    pinned: bool = False
+
+
+class ModelPool:
+    """
+    Lazily-loaded, size-bounded pool of per-site models.
+
+    Site artifacts live in ``<sites_dir>/<site_id>/`` using the same file
+    names as the default models directory. A site without its own
+    ``preprocessor.pkl`` uses the default one; identical preprocessor files
+    are loaded once and shared between sites. Sites without a model
+    directory are served by the default ``ModelManager``.
+
+    The budget is a disk-size estimate: the pickled sizes of site models,
+    calibrators and site-only preprocessors. The default model and its
+    preprocessor are not counted. Least-recently-used sites are evicted once
+    the estimate exceeds ``max_bytes``. ``n_jobs`` is passed on to every
+    site's ``ModelManager``.
+    """
+
+    def __init__(
+        self,
+        sites_dir: str,
+        default_manager: ModelManager,
+        max_bytes: int,
+        n_jobs: Optional[int] = None,
+    ):
+        self._sites_dir = sites_dir
+        self._default_manager = default_manager
+        self._max_bytes = max_bytes
+        self._n_jobs = n_jobs
+
+        self._entries: "OrderedDict[str, _PoolEntry]" = OrderedDict()
+        self._preprocessors: Dict[str, _SharedPreprocessor] = {}
+        self._site_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+        # The default preprocessor is always resident — share it, never evict it
+        default_path = os.path.join(default_manager.models_dir, PREPROCESSOR_FILENAME)
+        if os.path.exists(default_path):
+            self._preprocessors[_file_digest(default_path)] = _SharedPreprocessor(
+                preprocessor=default_manager.preprocessor,
+                size_bytes=0,
+                pinned=True,
+            )
+
+    def get(self, site_id: Optional[str]) -> ModelManager:
+        """Return the model manager serving ``site_id``, loading it if needed."""
+        if site_id is None:
+            return self._default_manager
+
+        site_dir = self._site_dir(site_id)
+        if not os.path.exists(os.path.join(site_dir, MODEL_FILENAME)):
+            return self._default_manager
+
+        with self._lock:
+            entry = self._entries.get(site_id)
+            if entry is not None:
+                self._entries.move_to_end(site_id)
+                return entry.manager
+            site_lock = self._site_locks.setdefault(site_id, threading.Lock())
+
+        # Load outside the pool lock so other sites keep being served
+        with site_lock:
+            with self._lock:
+                entry = self._entries.get(site_id)
+                if entry is not None:
+                    self._entries.move_to_end(site_id)
+                    return entry.manager
+            return self._load(site_id, site_dir)
+
+    def stats(self) -> dict:
+        """Snapshot of the pool contents, most recently used last."""
+        with self._lock:
+            return {
+                "loaded_sites": list(self._entries),
+                "shared_preprocessors": len(self._preprocessors),
+                "used_bytes": self._used_bytes(),
+                "max_bytes": self._max_bytes,
+            }
+
+    def _site_dir(self, site_id: str) -> str:
+        return os.path.join(self._sites_dir, validate_site_id(site_id))
+
+    def _load(self, site_id: str, site_dir: str) -> ModelManager:
+        preprocessor_path = os.path.join(site_dir, PREPROCESSOR_FILENAME)
+        if not os.path.exists(preprocessor_path):
+            preprocessor_path = os.path.join(self._default_manager.models_dir, PREPROCESSOR_FILENAME)
+        preprocessor_key = _file_digest(preprocessor_path)
+
+        with self._lock:
+            shared = self._preprocessors.get(preprocessor_key)
+        if shared is None:
+            logger.info("Loading preprocessor for site %s from %s", site_id, preprocessor_path)
+            shared = _SharedPreprocessor(
+                preprocessor=joblib.load(preprocessor_path),
+                size_bytes=os.path.getsize(preprocessor_path),
+            )
+
+        manager = ModelManager(site_dir, preprocessor=shared.preprocessor, n_jobs=self._n_jobs)
+        manager.load_models()
+        if site_id in self._default_manager.metadata.site_thresholds:
+            logger.warning(
+                "Site %s has its own model in %s; the per-site threshold in the default "
+                "metadata is ignored (using %.4f). Run optimize_threshold --models-dir %s",
+                site_id,
+                site_dir,
+                manager.threshold_for(site_id),
+                site_dir,
+            )
+
+        size_bytes = os.path.getsize(os.path.join(site_dir, MODEL_FILENAME))
+        if manager.metadata.calibrator_file:
+            size_bytes += os.path.getsize(os.path.join(site_dir, manager.metadata.calibrator_file))
+
+        with self._lock:
+            shared = self._preprocessors.setdefault(preprocessor_key, shared)
+            shared.refcount += 1
+            self._entries[site_id] = _PoolEntry(manager, size_bytes, preprocessor_key)
+            self._evict()
+            logger.info(
+                "Site %s loaded (%d sites resident, %.1f / %.1f MB)",
+                site_id,
+                len(self._entries),
+                self._used_bytes() / 2**20,
+                self._max_bytes / 2**20,
+            )
+        return manager
+
+    def _evict(self) -> None:
+        """Drop least-recently-used sites until under budget. Caller holds the lock."""
+        while self._used_bytes() > self._max_bytes and len(self._entries) > 1:
+            site_id, entry = self._entries.popitem(last=False)
+            shared = self._preprocessors[entry.preprocessor_key]
+            shared.refcount -= 1
+            if shared.refcount == 0 and not shared.pinned:
+                del self._preprocessors[entry.preprocessor_key]
+            logger.info("Evicted site %s from model pool", site_id)
+
+        if self._used_bytes() > self._max_bytes:
+            logger.warning(
+                "Model pool over budget with a single site resident (%.1f MB > %.1f MB)",
+                self._used_bytes() / 2**20,
+                self._max_bytes / 2**20,
+            )
+
+    def _used_bytes(self) -> int:
+        return sum(e.size_bytes for e in self._entries.values()) + sum(
+            p.size_bytes for p in self._preprocessors.values()
+        )
+
+
+def _file_digest(path: str) -> str:
+    """Content hash used to detect identical artifacts across sites."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
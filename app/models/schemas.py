@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Literal
+from pydantic import BaseModel, Field, computed_field
+from typing import Dict, List, Literal, Optional
 
 
 class MachineData(BaseModel):
@@ -81,3 +81,99 @@ class ErrorResponse(BaseModel):
 
     detail: str
     status_code: int
+
+
+class ModelMetadata(BaseModel):
+    """
+    Decision settings stored next to the model artifacts.
+
+    Written by the threshold-optimization job and read by ``ModelManager``
+    at startup. Missing fields fall back to the original tuned defaults.
+    """
+
+    threshold: float = Field(
+        default=0.8966,
+        ge=0.0,
+        description="Global classification threshold applied to (calibrated) probabilities",
+    )
+    site_thresholds: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Per-site thresholds overriding the global one",
+    )
+    calibration_method: Optional[Literal["isotonic", "platt"]] = Field(
+        default=None,
+        description="Calibration method fitted on top of the model, if any",
+    )
+    calibrator_file: Optional[str] = Field(
+        default=None,
+        description="File name of the pickled calibrator inside the models directory",
+    )
+    objective: Optional[str] = Field(
+        default=None,
+        description="Objective used to select the global threshold",
+    )
+    dataset: Optional[str] = Field(
+        default=None,
+        description="Labeled dataset the thresholds were derived from",
+    )
+    n_samples: Optional[int] = Field(
+        default=None,
+        description="Number of labeled rows scored by the job",
+    )
+    generated_at: Optional[str] = Field(
+        default=None,
+        description="UTC timestamp of the job run (ISO 8601)",
+    )
+
+
+JobStatus = Literal["queued", "running", "completed", "failed", "cancelled"]
+
+
+class JobResponse(BaseModel):
+    """Status of a background scoring job."""
+
+    job_id: str
+    status: JobStatus
+    site_id: Optional[str] = None
+    total_rows: int = Field(
+        description="Number of data rows in the submitted file — estimated from its line count "
+        "until the job completes, then the number of rows parsed"
+    )
+    processed_rows: int = Field(default=0, description="Rows processed so far")
+    invalid_rows: int = Field(default=0, description="Rows rejected by the input schema so far")
+    error: Optional[str] = None
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+    @computed_field(description="Fraction of rows scored (0.0 to 1.0)")
+    @property
+    def progress(self) -> float:
+        if self.total_rows == 0:
+            return 1.0 if self.status == "completed" else 0.0
+        return round(self.processed_rows / self.total_rows, 4)
+
+
+class JobResultRow(BaseModel):
+    """Prediction for one row of a scoring job, keyed by its position in the input."""
+
+    row: int = Field(description="Zero-based row index in the submitted file")
+    Failure_prediction: Optional[bool] = Field(
+        default=None, description="Whether the model predicts a machine failure (null for invalid rows)"
+    )
+    Failure_probability: Optional[float] = Field(
+        default=None, description="Probability of machine failure (null for invalid rows)"
+    )
+    error: Optional[str] = Field(
+        default=None, description="Why the row was rejected by the input schema, if it was"
+    )
+
+
+class JobResultPage(BaseModel):
+    """A page of scoring job results."""
+
+    job_id: str
+    offset: int
+    limit: int
+    total_rows: int
+    results: List[JobResultRow]
@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from app.controllers.api import home_controller as api_home
 from app.controllers.api import prediction_controller as api_prediction
+from app.controllers.api import job_controller as api_jobs
 from app.controllers.web import home_controller as web_home
 from app.controllers.web import prediction_controller as web_prediction
 
@@ -11,6 +12,7 @@ def register_routes(app: FastAPI) -> None:
     # --- API routes (versioned) ---
     app.include_router(api_home.router, prefix="/api/v1")
     app.include_router(api_prediction.router, prefix="/api/v1")
+    app.include_router(api_jobs.router, prefix="/api/v1")
 
     # --- Web routes ---
     app.include_router(web_home.router)
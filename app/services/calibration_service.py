@@ -0,0 +1,161 @@
+from dataclasses import dataclass
+from typing import Literal, Optional
+
+import numpy as np
+from sklearn.isotonic import IsotonicRegression
+from sklearn.linear_model import LogisticRegression
+
+CalibrationMethod = Literal["isotonic", "platt"]
+
+_EPS = 1e-7
+
+
+class ProbabilityCalibrator:
+    """
+    Post-hoc calibration of raw model probabilities.
+
+    Wraps either an isotonic regression or a Platt (logistic) scaler behind
+    a single ``transform`` method so it can be pickled next to the model and
+    applied at inference time without knowing which method was fitted.
+    """
+
+    def __init__(self, method: CalibrationMethod):
+        if method not in ("isotonic", "platt"):
+            raise ValueError(f"Unknown calibration method: {method!r}")
+        self.method = method
+        self._estimator = None
+
+    def fit(self, scores: np.ndarray, y_true: np.ndarray) -> "ProbabilityCalibrator":
+        """Fit the calibrator on raw probabilities and binary labels."""
+        scores = np.asarray(scores, dtype=float)
+        y_true = np.asarray(y_true, dtype=int)
+
+        if self.method == "isotonic":
+            self._estimator = IsotonicRegression(
+                y_min=0.0, y_max=1.0, out_of_bounds="clip"
+            )
+            self._estimator.fit(scores, y_true)
+        else:
+            self._estimator = LogisticRegression()
+            self._estimator.fit(_logit(scores).reshape(-1, 1), y_true)
+        return self
+
+    def transform(self, scores: np.ndarray) -> np.ndarray:
+        """Map raw probabilities to calibrated probabilities."""
+        if self._estimator is None:
+            raise RuntimeError("Calibrator not fitted. Call fit() first.")
+        scores = np.asarray(scores, dtype=float)
+
+        if self.method == "isotonic":
+            return self._estimator.predict(scores)
+        return self._estimator.predict_proba(_logit(scores).reshape(-1, 1))[:, 1]
+
+
+@dataclass
+class ThresholdCurve:
+    """
+    Confusion counts for every distinct decision threshold.
+
+    A sample is predicted positive when its score is ``>= thresholds[i]``.
+    The first entry is a sentinel above the highest score (nothing flagged).
+    """
+
+    thresholds: np.ndarray
+    tp: np.ndarray
+    fp: np.ndarray
+    n_positive: int
+    n_negative: int
+
+    @property
+    def fn(self) -> np.ndarray:
+        return self.n_positive - self.tp
+
+    @property
+    def tn(self) -> np.ndarray:
+        return self.n_negative - self.fp
+
+    @property
+    def precision(self) -> np.ndarray:
+        flagged = self.tp + self.fp
+        return np.divide(
+            self.tp, flagged, out=np.ones_like(self.tp, dtype=float), where=flagged > 0
+        )
+
+    @property
+    def recall(self) -> np.ndarray:
+        if self.n_positive == 0:
+            return np.zeros_like(self.tp, dtype=float)
+        return self.tp / self.n_positive
+
+    @property
+    def f1(self) -> np.ndarray:
+        denom = 2 * self.tp + self.fp + self.fn
+        return np.divide(
+            2 * self.tp, denom, out=np.zeros_like(self.tp, dtype=float), where=denom > 0
+        )
+
+    def cost(self, fp_cost: float, fn_cost: float) -> np.ndarray:
+        """Total misclassification cost at every threshold."""
+        return fp_cost * self.fp + fn_cost * self.fn
+
+
+def compute_threshold_curve(y_true: np.ndarray, scores: np.ndarray) -> ThresholdCurve:
+    """
+    Sweep all thresholds in a single sort + cumulative sum.
+
+    Sorting scores once makes the true-positive count at every candidate
+    threshold a prefix sum of the sorted labels, so the whole curve costs
+    O(n log n) instead of re-scoring the dataset per threshold.
+    """
+    y_true = np.asarray(y_true, dtype=int)
+    scores = np.asarray(scores, dtype=float)
+    if y_true.shape != scores.shape:
+        raise ValueError("y_true and scores must have the same shape")
+    if scores.size == 0:
+        raise ValueError("Cannot compute a threshold curve on an empty dataset")
+
+    order = np.argsort(-scores, kind="mergesort")
+    sorted_scores = scores[order]
+    sorted_labels = y_true[order]
+
+    # Last index of each run of tied scores — the cut points between thresholds
+    cut = np.r_[np.flatnonzero(np.diff(sorted_scores)), sorted_scores.size - 1]
+
+    tp = np.cumsum(sorted_labels)[cut]
+    fp = (cut + 1) - tp
+    thresholds = sorted_scores[cut]
+
+    n_positive = int(sorted_labels.sum())
+    return ThresholdCurve(
+        thresholds=np.r_[np.nextafter(thresholds[0], np.inf), thresholds],
+        tp=np.r_[0, tp],
+        fp=np.r_[0, fp],
+        n_positive=n_positive,
+        n_negative=int(scores.size - n_positive),
+    )
+
+
+def select_threshold(
+    curve: ThresholdCurve,
+    fp_cost: Optional[float] = None,
+    fn_cost: Optional[float] = None,
+) -> int:
+    """
+    Pick the index of the best threshold on a precomputed curve.
+
+    With costs, minimises ``fp_cost * FP + fn_cost * FN``; otherwise
+    maximises F1 (the objective used to tune the original threshold).
+    Ties resolve to the highest threshold, i.e. the fewest alarms.
+    """
+    if fp_cost is None and fn_cost is None:
+        return int(np.argmax(curve.f1))
+    if fp_cost is None or fn_cost is None:
+        raise ValueError("fp_cost and fn_cost must be given together")
+    if fp_cost < 0 or fn_cost < 0:
+        raise ValueError("Costs must be non-negative")
+    return int(np.argmin(curve.cost(fp_cost, fn_cost)))
+
+
+def _logit(p: np.ndarray) -> np.ndarray:
+    p = np.clip(p, _EPS, 1 - _EPS)
+    return np.log(p / (1 - p))
@@ -0,0 +1,435 @@
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import uuid
+from bisect import bisect_right
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO, List, Literal, Optional, Tuple, get_args, get_origin
+
+import numpy as np
+import pandas as pd
+
+from app.core.logging import get_logger, setup_logging
+from app.models.job_store import JobStore
+from app.models.ml_models import ModelManager
+from app.models.model_pool import ModelPool, validate_site_id
+from app.models.schemas import JobResponse, JobResultPage, JobResultRow, MachineData
+from app.services.prediction_service import PredictionService
+
+logger = get_logger(__name__)
+
+REQUIRED_COLUMNS = [field.alias for field in MachineData.model_fields.values()]
+RESULT_COLUMNS = ["row", "Failure_prediction", "Failure_probability", "error"]
+
+INPUT_FILENAME = "input.csv"
+RESULT_FILENAME = "result.csv"
+RESULT_INDEX_FILENAME = "result.index.json"
+_COPY_BUFFER = 1 << 20
+
+
+class JobNotFoundError(LookupError):
+    """Raised when a job id is unknown."""
+
+
+class JobNotReadyError(RuntimeError):
+    """Raised when results are requested for a job that has not completed."""
+
+
+class JobService:
+    """
+    Runs large scoring jobs in the background.
+
+    Submitted CSV files are stored on disk and scored chunk by chunk by a
+    bounded pool of worker processes. Each worker loads its own copy of the
+    models, capped to ``threads_per_worker`` XGBoost threads, so batch work
+    never holds the API process's GIL and uses at most
+    ``max_workers * threads_per_worker`` cores for inference.
+    Job state lives in SQLite and results are written next to the input, so
+    status and results can be served by any API worker sharing ``jobs_dir``.
+
+    Rows are checked against the ``MachineData`` constraints; rejected rows
+    get an ``error`` instead of a prediction.
+    """
+
+    def __init__(
+        self,
+        jobs_dir: str,
+        models_dir: str,
+        site_models_dir: str,
+        model_pool_max_bytes: int,
+        max_workers: int = 2,
+        chunk_size: int = 10_000,
+        threads_per_worker: int = 1,
+        retention_hours: float = 72,
+    ):
+        self._jobs_dir = jobs_dir
+        self._retention = timedelta(hours=retention_hours) if retention_hours > 0 else None
+        self._store = JobStore(os.path.join(jobs_dir, "jobs.sqlite3"))
+
+        # Spawn, not fork: the API process runs threads that must not be forked
+        context = multiprocessing.get_context("spawn")
+        self._stopping = context.Event()
+        self._executor_args = dict(
+            max_workers=max_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(
+                jobs_dir,
+                models_dir,
+                site_models_dir,
+                model_pool_max_bytes,
+                chunk_size,
+                threads_per_worker,
+                self._stopping,
+                logging.getLevelName(logging.getLogger().getEffectiveLevel()),
+            ),
+        )
+        self._executor = ProcessPoolExecutor(**self._executor_args)
+
+        orphaned = self._store.fail_orphaned("Interrupted by server restart")
+        for job_id in orphaned:
+            _remove_work_files(self._job_dir(job_id))
+        if orphaned:
+            logger.warning("Marked %d interrupted job(s) as failed", len(orphaned))
+        self.purge_expired()
+
+    def submit(self, source: BinaryIO, site_id: Optional[str] = None) -> JobResponse:
+        """
+        Store an uploaded CSV and queue it for scoring.
+
+        The file must have a header row with the original dataset column
+        names; extra columns are ignored. Raises ``ValueError`` when required
+        columns are missing.
+        """
+        if site_id is not None:
+            validate_site_id(site_id)
+
+        self.purge_expired()
+
+        job_id = uuid.uuid4().hex
+        job_dir = self._job_dir(job_id)
+        os.makedirs(job_dir)
+
+        try:
+            input_path = os.path.join(job_dir, INPUT_FILENAME)
+            total_rows = _copy_counting_rows(source, input_path)
+            _check_columns(input_path)
+        except Exception:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise
+
+        job = self._store.create(job_id, total_rows, site_id)
+        try:
+            future = self._executor.submit(_run_job, job_id, site_id)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory) — start a fresh pool
+            logger.warning("Job worker pool was broken; restarting it")
+            self._executor = ProcessPoolExecutor(**self._executor_args)
+            future = self._executor.submit(_run_job, job_id, site_id)
+        future.add_done_callback(lambda f: self._on_worker_done(job_id, f))
+
+        logger.info("Queued job %s (%d rows, site=%s)", job_id, total_rows, site_id)
+        return job
+
+    def get(self, job_id: str) -> JobResponse:
+        job = self._store.get(job_id)
+        if job is None:
+            raise JobNotFoundError(f"Job not found: {job_id}")
+        return job
+
+    def cancel(self, job_id: str) -> JobResponse:
+        """Cancel a queued or running job. Finished jobs are returned unchanged."""
+        self.get(job_id)
+        if self._store.finish(job_id, "cancelled"):
+            logger.info("Cancelled job %s", job_id)
+        return self.get(job_id)
+
+    def result_path(self, job_id: str) -> str:
+        """Path of the result CSV of a completed job."""
+        job = self.get(job_id)
+        if job.status != "completed":
+            raise JobNotReadyError(f"Job {job_id} is {job.status}")
+        return os.path.join(self._job_dir(job_id), RESULT_FILENAME)
+
+    def result_page(self, job_id: str, offset: int = 0, limit: int = 1000) -> JobResultPage:
+        """
+        Read ``limit`` result rows starting at row ``offset``.
+
+        Seeks straight to the chunk holding ``offset`` using the byte offsets
+        recorded while the job ran, so page cost does not grow with ``offset``.
+        """
+        job = self.get(job_id)
+        path = self.result_path(job_id)
+
+        page = pd.DataFrame(columns=RESULT_COLUMNS)
+        if offset < job.processed_rows:
+            with open(os.path.join(self._job_dir(job_id), RESULT_INDEX_FILENAME), encoding="utf-8") as f:
+                index = json.load(f)
+            chunk = bisect_right(index["rows"], offset) - 1
+
+            with open(path, "rb") as f:
+                f.seek(index["offsets"][chunk])
+                page = pd.read_csv(
+                    f,
+                    header=None,
+                    names=RESULT_COLUMNS,
+                    skiprows=offset - index["rows"][chunk],
+                    nrows=limit,
+                )
+
+        records = page.astype(object).where(page.notna(), None).to_dict(orient="records")
+        return JobResultPage(
+            job_id=job_id,
+            offset=offset,
+            limit=limit,
+            total_rows=job.total_rows,
+            results=[JobResultRow(**record) for record in records],
+        )
+
+    def purge_expired(self) -> int:
+        """
+        Delete jobs, and their files, that finished more than the retention
+        period ago. Runs at startup and on every submission; returns the count.
+        """
+        if self._retention is None:
+            return 0
+        expired = self._store.purge_finished(datetime.now(timezone.utc) - self._retention)
+        for job_id in expired:
+            shutil.rmtree(self._job_dir(job_id), ignore_errors=True)
+        if expired:
+            logger.info("Purged %d expired job(s)", len(expired))
+        return len(expired)
+
+    def shutdown(self) -> None:
+        """
+        Stop accepting work.
+
+        Running jobs stop after their current chunk and are marked failed;
+        jobs still queued are failed on the next startup.
+        """
+        self._stopping.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _job_dir(self, job_id: str) -> str:
+        return os.path.join(self._jobs_dir, job_id)
+
+    def _on_worker_done(self, job_id: str, future: Future) -> None:
+        """Fail a job whose worker process died before it could record the outcome."""
+        if future.cancelled() or future.exception() is None:
+            return
+        logger.error("Worker for job %s died: %s", job_id, future.exception())
+        self._store.finish(job_id, "failed", "Worker process terminated unexpectedly")
+        _remove_work_files(self._job_dir(job_id))
+
+
+class _JobWorker:
+    """Scores jobs inside a worker process, with models of its own."""
+
+    def __init__(
+        self,
+        jobs_dir: str,
+        prediction_service: PredictionService,
+        chunk_size: int,
+        stopping,
+    ):
+        self._jobs_dir = jobs_dir
+        self._prediction_service = prediction_service
+        self._chunk_size = chunk_size
+        self._stopping = stopping
+        self._store = JobStore(os.path.join(jobs_dir, "jobs.sqlite3"))
+
+    def run(self, job_id: str, site_id: Optional[str]) -> None:
+        """Score the input file of a job chunk by chunk."""
+        job_dir = os.path.join(self._jobs_dir, job_id)
+        input_path = os.path.join(job_dir, INPUT_FILENAME)
+        result_path = os.path.join(job_dir, RESULT_FILENAME)
+        partial_path = result_path + ".part"
+
+        try:
+            if self._stopping.is_set() or not self._store.mark_running(job_id):
+                return  # shutting down, or cancelled while queued
+            logger.info("Starting job %s", job_id)
+
+            processed = 0
+            invalid = 0
+            index = {"rows": [], "offsets": []}
+            pd.DataFrame(columns=RESULT_COLUMNS).to_csv(partial_path, index=False)
+
+            for chunk in pd.read_csv(input_path, chunksize=self._chunk_size):
+                if self._stopping.is_set():
+                    logger.warning("Job %s interrupted by shutdown after %d rows", job_id, processed)
+                    self._store.finish(job_id, "failed", "Interrupted by server shutdown")
+                    os.remove(partial_path)
+                    return
+                # Cancellation is recorded in the store, so any API worker can request it
+                if self._store.get_status(job_id) != "running":
+                    logger.info("Job %s stopped after %d rows", job_id, processed)
+                    os.remove(partial_path)
+                    return
+
+                result = self._score_chunk(chunk, processed, site_id)
+
+                index["rows"].append(processed)
+                index["offsets"].append(os.path.getsize(partial_path))
+                result.to_csv(partial_path, mode="a", header=False, index=False)
+
+                processed += len(chunk)
+                invalid += int(result["error"].notna().sum())
+                self._store.update_progress(job_id, processed, invalid)
+
+            with open(os.path.join(job_dir, RESULT_INDEX_FILENAME), "w", encoding="utf-8") as f:
+                json.dump(index, f)
+            os.replace(partial_path, result_path)
+            # Line counting at submission over-counts blank lines and quoted newlines
+            if self._store.finish(job_id, "completed", total_rows=processed):
+                logger.info("Job %s completed (%d rows, %d invalid)", job_id, processed, invalid)
+            else:
+                os.remove(result_path)  # cancelled after the last chunk
+        except Exception as e:
+            logger.error("Job %s failed: %s", job_id, str(e), exc_info=True)
+            self._store.finish(job_id, "failed", str(e))
+        finally:
+            _remove_work_files(job_dir)
+
+    def _score_chunk(self, chunk: pd.DataFrame, first_row: int, site_id: Optional[str]) -> pd.DataFrame:
+        """Validate a chunk and score its valid rows; invalid rows carry an error."""
+        inputs, errors = _validate_chunk(chunk)
+        valid = errors.isna()
+
+        result = pd.DataFrame(
+            {
+                "row": np.arange(first_row, first_row + len(chunk)),
+                "Failure_prediction": pd.Series(None, index=chunk.index, dtype=object),
+                "Failure_probability": np.nan,
+                "error": errors,
+            },
+            index=chunk.index,
+        )
+        if valid.any():
+            predictions = self._prediction_service.predict_batch(inputs[valid], site_id=site_id)
+            result.loc[valid, "Failure_prediction"] = predictions["Failure_prediction"]
+            result.loc[valid, "Failure_probability"] = predictions["Failure_probability"]
+        return result
+
+
+_worker: Optional[_JobWorker] = None
+
+
+def _init_worker(
+    jobs_dir: str,
+    models_dir: str,
+    site_models_dir: str,
+    model_pool_max_bytes: int,
+    chunk_size: int,
+    threads_per_worker: int,
+    stopping,
+    log_level: str,
+) -> None:
+    """Worker process initializer: load the models once per process."""
+    global _worker
+    setup_logging(log_level)
+
+    model_manager = ModelManager(models_dir, n_jobs=threads_per_worker)
+    model_manager.load_models()
+    model_pool = ModelPool(
+        site_models_dir,
+        default_manager=model_manager,
+        max_bytes=model_pool_max_bytes,
+        n_jobs=threads_per_worker,
+    )
+    _worker = _JobWorker(jobs_dir, PredictionService(model_manager, model_pool), chunk_size, stopping)
+
+
+def _run_job(job_id: str, site_id: Optional[str]) -> None:
+    """Worker process entry point."""
+    _worker.run(job_id, site_id)
+
+
+def _remove_work_files(job_dir: str) -> None:
+    """Delete the input and any partial result of a job that will not run again."""
+    for filename in (INPUT_FILENAME, RESULT_FILENAME + ".part"):
+        path = os.path.join(job_dir, filename)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _field_rules() -> List[Tuple[str, Optional[tuple], Optional[float], Optional[float]]]:
+    """(column, allowed values, min, max) for every ``MachineData`` field."""
+    rules = []
+    for field in MachineData.model_fields.values():
+        choices = get_args(field.annotation) if get_origin(field.annotation) is Literal else None
+        ge = next((c.ge for c in field.metadata if hasattr(c, "ge")), None)
+        le = next((c.le for c in field.metadata if hasattr(c, "le")), None)
+        rules.append((field.alias, choices, ge, le))
+    return rules
+
+
+_FIELD_RULES = _field_rules()
+
+
+def _validate_chunk(chunk: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Apply the ``MachineData`` constraints to a chunk, column by column.
+
+    Returns the typed input columns and a per-row error message (NaN for
+    valid rows), matching what ``/predict/xgboost`` would reject.
+    """
+    inputs = pd.DataFrame(index=chunk.index)
+    messages = pd.Series("", index=chunk.index, dtype=object)
+
+    for column, choices, ge, le in _FIELD_RULES:
+        if choices is not None:
+            values = chunk[column].astype(str).str.strip()
+            bad = ~values.isin(choices)
+            message = f"{column} must be one of {', '.join(choices)}"
+        else:
+            values = pd.to_numeric(chunk[column], errors="coerce")
+            bad = values.isna()
+            limits = []
+            if ge is not None:
+                bad |= values < ge
+                limits.append(f">= {ge:g}")
+            if le is not None:
+                bad |= values > le
+                limits.append(f"<= {le:g}")
+            message = f"{column} must be a number" + (f" {' and '.join(limits)}" if limits else "")
+
+        inputs[column] = values
+        messages[bad] += message + "; "
+
+    errors = messages.str.rstrip("; ").replace("", np.nan)
+    return inputs, errors
+
+
+def _copy_counting_rows(source: BinaryIO, path: str) -> int:
+    """
+    Stream ``source`` to ``path`` and return an estimate of the data rows.
+
+    Counts lines, so blank lines and newlines inside quoted fields are
+    included; the job records the parsed row count once it completes.
+    """
+    newlines = 0
+    last = b""
+    with open(path, "wb") as f:
+        for block in iter(lambda: source.read(_COPY_BUFFER), b""):
+            f.write(block)
+            newlines += block.count(b"\n")
+            last = block[-1:]
+
+    lines = newlines + (1 if last and last != b"\n" else 0)
+    return max(lines - 1, 0)  # minus the header
+
+
+def _check_columns(path: str) -> None:
+    try:
+        columns = pd.read_csv(path, nrows=0).columns
+    except pd.errors.EmptyDataError:
+        raise ValueError("Uploaded file is empty")
+
+    missing = [c for c in REQUIRED_COLUMNS if c not in columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
@@ -1,6 +1,10 @@
+import numpy as np
 import pandas as pd
+from typing import Optional
+
 from app.models.schemas import MachineData, PredictionResponse
 from app.models.ml_models import ModelManager
+from app.models.model_pool import ModelPool
 from app.services.feature_engineering import add_engineered_features
 from app.core.logging import get_logger
 
@@ -15,33 +19,96 @@ class PredictionService:
     web controllers, CLI tools, or scheduled jobs.
     """
 
-    def __init__(self, model_manager: ModelManager):
+    def __init__(self, model_manager: ModelManager, model_pool: Optional[ModelPool] = None):
         self._model_manager = model_manager
+        self._model_pool = model_pool
+
+    def _manager_for(self, site_id: Optional[str]) -> ModelManager:
+        """Resolve the model serving a site — the default one when no pool is configured."""
+        if site_id is None or self._model_pool is None:
+            return self._model_manager
+        return self._model_pool.get(site_id)
+
+    def predict_proba_batch(
+        self,
+        df: pd.DataFrame,
+        calibrated: bool = True,
+        site_id: Optional[str] = None,
+    ) -> np.ndarray:
+        """
+        Score a DataFrame of raw sensor rows in a single batched pass.
 
-    def predict(self, data: MachineData) -> PredictionResponse:
+        ``df`` must contain the original dataset column names; extra columns
+        (IDs, labels) are ignored by the preprocessor. All rows are scored by
+        the model serving ``site_id``. When ``calibrated`` is True and a
+        calibrator is loaded, calibrated probabilities are returned.
+        """
+        return self._score(self._manager_for(site_id), df, calibrated)
+
+    def _score(
+        self,
+        model_manager: ModelManager,
+        df: pd.DataFrame,
+        calibrated: bool = True,
+    ) -> np.ndarray:
+        """Feature engineering → preprocessing → inference → calibration for one model."""
+        # 1. Add engineered features
+        df = add_engineered_features(df)
+
+        # 2. Apply preprocessing pipeline
+        X_processed = model_manager.preprocessor.transform(df)
+
+        # 3. Get failure probabilities
+        y_prob = model_manager.model.predict_proba(X_processed)[:, 1]
+
+        # 4. Optionally map to calibrated probabilities
+        calibrator = model_manager.calibrator
+        if calibrated and calibrator is not None:
+            y_prob = calibrator.transform(y_prob)
+
+        return y_prob
+
+    def predict_batch(
+        self,
+        df: pd.DataFrame,
+        site_id: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """
+        Score and classify a DataFrame of raw sensor rows with one site's model.
+
+        Returns a DataFrame aligned with ``df`` holding the same fields as
+        ``PredictionResponse``.
+        """
+        model_manager = self._manager_for(site_id)
+        y_prob = self._score(model_manager, df)
+
+        return pd.DataFrame(
+            {
+                "Failure_prediction": y_prob >= model_manager.threshold_for(site_id),
+                "Failure_probability": y_prob,
+            },
+            index=df.index,
+        )
+
+    def predict(self, data: MachineData, site_id: Optional[str] = None) -> PredictionResponse:
         """
         Run a prediction for the given machine data.
 
         Pipeline: schema → DataFrame → feature engineering →
-                  preprocessing → model inference → threshold → response
+                  preprocessing → model inference → calibration →
+                  threshold → response
         """
-        logger.info("Starting prediction for input: Type=%s", data.type)
+        logger.info("Starting prediction for input: Type=%s, site=%s", data.type, site_id)
+        model_manager = self._manager_for(site_id)
 
         # 1. Convert Pydantic model to DataFrame (using aliases for column names)
         df = pd.DataFrame([data.model_dump(by_alias=True)])
 
-        # 2. Add engineered features
-        df = add_engineered_features(df)
-
-        # 3. Apply preprocessing pipeline
-        X_processed = self._model_manager.preprocessor.transform(df)
-
-        # 4. Get failure probability
-        y_prob = self._model_manager.model.predict_proba(X_processed)[:, 1]
-        failure_probability = float(y_prob[0])
+        # 2. Feature engineering, preprocessing, inference and calibration
+        failure_probability = float(self._score(model_manager, df)[0])
 
-        # 5. Apply tuned threshold
-        failure_prediction = failure_probability >= self._model_manager.threshold
+        # 3. Apply tuned threshold (per-site when configured)
+        failure_prediction = failure_probability >= model_manager.threshold_for(site_id)
 
         logger.info(
             "Prediction complete: probability=%.4f, prediction=%s",
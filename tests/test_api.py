@@ -1,14 +1,19 @@
 import pytest
 from fastapi.testclient import TestClient
 from app import create_app
+from app.core.config import get_settings
 
 
 @pytest.fixture(scope="module")
-def client():
+def client(tmp_path_factory):
     """Create a test client using the app factory."""
-    app = create_app()
-    with TestClient(app) as c:
-        yield c
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("JOBS_DIR", str(tmp_path_factory.mktemp("jobs")))
+        get_settings.cache_clear()
+        app = create_app()
+        with TestClient(app) as c:
+            yield c
+    get_settings.cache_clear()
 
 
 # --- API Tests ---
@@ -55,6 +60,24 @@ class TestAPIPrediction:
         response = client.post("/api/v1/predict/xgboost", json=payload)
         assert response.status_code == 422
 
+    def test_predict_with_site_header(self, client):
+        response = client.post(
+            "/api/v1/predict/xgboost",
+            json=self.VALID_PAYLOAD,
+            headers={"X-Site-ID": "plant-a"},
+        )
+        assert response.status_code == 200
+        assert 0.0 <= response.json()["Failure_probability"] <= 1.0
+
+    def test_predict_site_path(self, client):
+        response = client.post("/api/v1/sites/plant-a/predict/xgboost", json=self.VALID_PAYLOAD)
+        assert response.status_code == 200
+        assert isinstance(response.json()["Failure_prediction"], bool)
+
+    def test_predict_invalid_site(self, client):
+        response = client.post("/api/v1/sites/bad!id/predict/xgboost", json=self.VALID_PAYLOAD)
+        assert response.status_code == 400
+
 
 # --- Web Tests ---
 
@@ -0,0 +1,156 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.config import get_settings
+from app.jobs.optimize_threshold import optimize_thresholds
+from app.models.ml_models import ModelManager, PREPROCESSOR_FILENAME, MODEL_FILENAME
+from app.models.schemas import ModelMetadata
+from app.services.calibration_service import (
+    ProbabilityCalibrator,
+    compute_threshold_curve,
+    select_threshold,
+)
+from app.services.prediction_service import PredictionService
+
+
+@pytest.fixture
+def labeled_scores():
+    rng = np.random.default_rng(0)
+    y_true = rng.integers(0, 2, size=500)
+    # Rounded so that ties between scores are exercised
+    scores = np.round(np.clip(0.3 * y_true + rng.random(500) * 0.7, 0, 1), 2)
+    return y_true, scores
+
+
+# --- Threshold sweep ---
+
+class TestThresholdCurve:
+    def test_matches_brute_force(self, labeled_scores):
+        y_true, scores = labeled_scores
+        curve = compute_threshold_curve(y_true, scores)
+
+        for i, t in enumerate(curve.thresholds):
+            y_pred = scores >= t
+            assert curve.tp[i] == np.sum(y_pred & (y_true == 1))
+            assert curve.fp[i] == np.sum(y_pred & (y_true == 0))
+
+    def test_sentinel_flags_nothing(self, labeled_scores):
+        y_true, scores = labeled_scores
+        curve = compute_threshold_curve(y_true, scores)
+        assert curve.thresholds[0] > scores.max()
+        assert curve.tp[0] == 0 and curve.fp[0] == 0
+        assert curve.fn[0] == y_true.sum()
+
+    def test_cost_selection_is_optimal(self, labeled_scores):
+        y_true, scores = labeled_scores
+        curve = compute_threshold_curve(y_true, scores)
+
+        for fp_cost, fn_cost in [(1.0, 1.0), (1.0, 20.0), (20.0, 1.0)]:
+            idx = select_threshold(curve, fp_cost, fn_cost)
+            brute = min(
+                fp_cost * np.sum((scores >= t) & (y_true == 0))
+                + fn_cost * np.sum((scores < t) & (y_true == 1))
+                for t in np.unique(scores)
+            )
+            assert curve.cost(fp_cost, fn_cost)[idx] <= brute
+
+    def test_higher_miss_cost_lowers_threshold(self, labeled_scores):
+        y_true, scores = labeled_scores
+        curve = compute_threshold_curve(y_true, scores)
+        cautious = curve.thresholds[select_threshold(curve, 1.0, 50.0)]
+        relaxed = curve.thresholds[select_threshold(curve, 50.0, 1.0)]
+        assert cautious < relaxed
+
+    def test_costs_must_be_paired(self, labeled_scores):
+        curve = compute_threshold_curve(*labeled_scores)
+        with pytest.raises(ValueError):
+            select_threshold(curve, fp_cost=1.0)
+
+
+# --- Calibration ---
+
+class TestProbabilityCalibrator:
+    @pytest.mark.parametrize("method", ["isotonic", "platt"])
+    def test_output_is_monotonic_probability(self, labeled_scores, method):
+        y_true, scores = labeled_scores
+        calibrator = ProbabilityCalibrator(method).fit(scores, y_true)
+
+        grid = np.linspace(0, 1, 101)
+        calibrated = calibrator.transform(grid)
+        assert np.all((calibrated >= 0) & (calibrated <= 1))
+        assert np.all(np.diff(calibrated) >= -1e-12)
+
+    def test_unknown_method(self):
+        with pytest.raises(ValueError):
+            ProbabilityCalibrator("beta")
+
+
+# --- Metadata round trip ---
+
+class TestModelMetadata:
+    def test_manager_loads_saved_metadata(self, tmp_path, labeled_scores):
+        models_dir = get_settings().MODELS_DIR
+        for filename in (PREPROCESSOR_FILENAME, MODEL_FILENAME):
+            shutil.copy(os.path.join(models_dir, filename), tmp_path / filename)
+
+        y_true, scores = labeled_scores
+        calibrator = ProbabilityCalibrator("isotonic").fit(scores, y_true)
+        ModelManager(str(tmp_path)).save_metadata(
+            ModelMetadata(
+                threshold=0.42,
+                site_thresholds={"plant-a": 0.1},
+                calibration_method="isotonic",
+            ),
+            calibrator,
+        )
+
+        manager = ModelManager(str(tmp_path))
+        manager.load_models()
+        assert manager.threshold == pytest.approx(0.42)
+        assert manager.threshold_for("plant-a") == pytest.approx(0.1)
+        assert manager.threshold_for("unknown-site") == pytest.approx(0.42)
+        assert isinstance(manager.calibrator, ProbabilityCalibrator)
+
+    def test_defaults_without_metadata(self, tmp_path):
+        models_dir = get_settings().MODELS_DIR
+        for filename in (PREPROCESSOR_FILENAME, MODEL_FILENAME):
+            shutil.copy(os.path.join(models_dir, filename), tmp_path / filename)
+
+        manager = ModelManager(str(tmp_path))
+        manager.load_models()
+        assert manager.threshold == pytest.approx(0.8966)
+        assert manager.calibrator is None
+
+
+# --- Optimization job ---
+
+class TestOptimizeThresholds:
+    @pytest.fixture(scope="class")
+    def prediction_service(self):
+        manager = ModelManager(get_settings().MODELS_DIR)
+        manager.load_models()
+        return PredictionService(manager)
+
+    @pytest.fixture(scope="class")
+    def labeled_df(self):
+        return pd.read_csv(os.path.join(get_settings().BASE_DIR, "Data", "ai4i2020.csv"), nrows=3000)
+
+    def test_holdout_separates_calibration_and_sweep(self, prediction_service, labeled_df, caplog):
+        with caplog.at_level("INFO"):
+            metadata, calibrator = optimize_thresholds(
+                prediction_service, labeled_df, calibration="isotonic", holdout=0.3
+            )
+
+        assert isinstance(calibrator, ProbabilityCalibrator)
+        assert metadata.calibration_method == "isotonic"
+        assert "sweeping on 900 held-out rows" in caplog.text
+        assert "same rows" not in caplog.text
+
+    def test_warns_when_calibration_shares_sweep_rows(self, prediction_service, labeled_df, caplog):
+        with caplog.at_level("WARNING"):
+            optimize_thresholds(prediction_service, labeled_df, calibration="platt")
+        assert "same rows" in caplog.text
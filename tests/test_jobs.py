@@ -0,0 +1,306 @@
+import io
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app import create_app
+from app.core.config import get_settings
+from app.models.job_store import JobStore
+from app.services.job_service import REQUIRED_COLUMNS, JobNotFoundError, JobService
+
+DATA_PATH = os.path.join(get_settings().BASE_DIR, "Data", "ai4i2020.csv")
+N_ROWS = 250
+CHUNK_SIZE = 10
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    """App wired to a temporary jobs directory with small chunks."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("JOBS_DIR", str(tmp_path_factory.mktemp("jobs")))
+        mp.setenv("JOB_CHUNK_SIZE", str(CHUNK_SIZE))
+        get_settings.cache_clear()
+        app = create_app()
+        with TestClient(app) as c:
+            yield c
+    get_settings.cache_clear()
+
+
+@pytest.fixture(scope="module")
+def sample_csv():
+    buffer = io.StringIO()
+    pd.read_csv(DATA_PATH, nrows=N_ROWS).to_csv(buffer, index=False)
+    return buffer.getvalue().encode()
+
+
+@pytest.fixture(scope="module")
+def large_csv():
+    """Full dataset — 1000 chunks, long enough to act on a running job."""
+    with open(DATA_PATH, "rb") as f:
+        return f.read()
+
+
+def _job_service(jobs_dir, **kwargs):
+    settings = get_settings()
+    kwargs.setdefault("chunk_size", CHUNK_SIZE)
+    return JobService(
+        str(jobs_dir),
+        settings.MODELS_DIR,
+        settings.SITE_MODELS_DIR,
+        settings.MODEL_POOL_MAX_MB * 2**20,
+        **kwargs,
+    )
+
+
+def _wait_until_scoring(service, job_id, timeout=60.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = service.get(job_id)
+        if job.status == "running" and job.processed_rows > 0:
+            return
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} did not start scoring in {timeout}s")
+
+
+def _wait_until_finished(client, job_id, timeout=30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = client.get(f"/api/v1/jobs/{job_id}").json()
+        if job["status"] not in ("queued", "running"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} did not finish in {timeout}s")
+
+
+# --- API Tests ---
+
+class TestJobAPI:
+    def test_submit_and_retrieve_results(self, client, sample_csv):
+        response = client.post(
+            "/api/v1/jobs", files={"file": ("machines.csv", sample_csv, "text/csv")}
+        )
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] in ("queued", "running", "completed")
+        assert job["total_rows"] == N_ROWS
+
+        job = _wait_until_finished(client, job["job_id"])
+        assert job["status"] == "completed"
+        assert job["processed_rows"] == N_ROWS
+        assert job["progress"] == 1.0
+
+        response = client.get(f"/api/v1/jobs/{job['job_id']}/result")
+        assert response.status_code == 200
+        assert "text/csv" in response.headers["content-type"]
+        result = pd.read_csv(io.BytesIO(response.content))
+        assert list(result["row"]) == list(range(N_ROWS))
+
+        response = client.get(
+            f"/api/v1/jobs/{job['job_id']}/result/page", params={"offset": 200, "limit": 100}
+        )
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["results"]) == N_ROWS - 200
+        assert page["results"][0]["row"] == 200
+        assert page["results"][0]["Failure_probability"] == pytest.approx(
+            result.loc[200, "Failure_probability"]
+        )
+
+    def test_results_match_synchronous_predictions(self, client, sample_csv):
+        job = client.post(
+            "/api/v1/jobs", files={"file": ("machines.csv", sample_csv, "text/csv")}
+        ).json()
+        _wait_until_finished(client, job["job_id"])
+        page = client.get(f"/api/v1/jobs/{job['job_id']}/result/page", params={"limit": 1}).json()
+
+        payload = pd.read_csv(DATA_PATH, nrows=1)[REQUIRED_COLUMNS].to_dict(orient="records")[0]
+        expected = client.post("/api/v1/predict/xgboost", json=payload).json()
+        assert page["results"][0]["Failure_probability"] == pytest.approx(
+            expected["Failure_probability"], rel=1e-5
+        )
+
+    def test_invalid_rows_are_rejected_not_scored(self, client):
+        rows = pd.read_csv(DATA_PATH, nrows=4)
+        rows.loc[1, "Type"] = "Z"
+        rows.loc[2, "Air temperature [K]"] = -5000
+        rows.loc[3, "Torque [Nm]"] = None
+        buffer = io.StringIO()
+        rows.to_csv(buffer, index=False)
+
+        job = client.post(
+            "/api/v1/jobs", files={"file": ("machines.csv", buffer.getvalue().encode(), "text/csv")}
+        ).json()
+        job = _wait_until_finished(client, job["job_id"])
+        assert job["status"] == "completed"
+        assert job["invalid_rows"] == 3
+
+        results = client.get(f"/api/v1/jobs/{job['job_id']}/result/page").json()["results"]
+        assert results[0]["error"] is None
+        assert isinstance(results[0]["Failure_prediction"], bool)
+        for result, column in zip(
+            results[1:], ["Type", "Air temperature [K]", "Torque [Nm]"]
+        ):
+            assert column in result["error"]
+            assert result["Failure_prediction"] is None
+            assert result["Failure_probability"] is None
+
+    def test_total_rows_is_parsed_count_on_completion(self, client, sample_csv):
+        job = client.post(
+            "/api/v1/jobs", files={"file": ("machines.csv", sample_csv + b"\n\n", "text/csv")}
+        ).json()
+        job = _wait_until_finished(client, job["job_id"])
+        assert job["status"] == "completed"
+        assert job["total_rows"] == job["processed_rows"] == N_ROWS
+        assert job["progress"] == 1.0
+
+    def test_cancel_running_job(self, client, large_csv):
+        service = client.app.state.job_service
+        job = client.post(
+            "/api/v1/jobs", files={"file": ("machines.csv", large_csv, "text/csv")}
+        ).json()
+        _wait_until_scoring(service, job["job_id"])
+
+        response = client.post(f"/api/v1/jobs/{job['job_id']}/cancel")
+        assert response.status_code == 200
+        assert response.json()["status"] == "cancelled"
+
+        job = client.get(f"/api/v1/jobs/{job['job_id']}").json()
+        assert job["status"] == "cancelled"
+        assert job["processed_rows"] < job["total_rows"]
+        assert client.get(f"/api/v1/jobs/{job['job_id']}/result").status_code == 409
+
+    def test_submit_missing_columns(self, client):
+        response = client.post(
+            "/api/v1/jobs", files={"file": ("bad.csv", b"Type,Torque [Nm]\nM,40\n", "text/csv")}
+        )
+        assert response.status_code == 400
+
+    def test_submit_invalid_site(self, client, sample_csv):
+        response = client.post(
+            "/api/v1/jobs",
+            files={"file": ("machines.csv", sample_csv, "text/csv")},
+            data={"site_id": "bad!id"},
+        )
+        assert response.status_code == 400
+
+    def test_unknown_job(self, client):
+        assert client.get("/api/v1/jobs/does-not-exist").status_code == 404
+        assert client.get("/api/v1/jobs/does-not-exist/result").status_code == 404
+        assert client.post("/api/v1/jobs/does-not-exist/cancel").status_code == 404
+
+
+# --- Job state ---
+
+class TestJobStore:
+    def test_cancelled_job_does_not_start(self, tmp_path):
+        store = JobStore(str(tmp_path / "jobs.sqlite3"))
+        store.create("job-1", total_rows=10)
+
+        assert store.finish("job-1", "cancelled")
+        assert not store.mark_running("job-1")
+        assert store.get("job-1").status == "cancelled"
+
+    def test_finished_job_cannot_be_cancelled(self, tmp_path):
+        store = JobStore(str(tmp_path / "jobs.sqlite3"))
+        store.create("job-1", total_rows=10)
+        store.mark_running("job-1")
+        store.update_progress("job-1", 10)
+
+        assert store.finish("job-1", "completed")
+        assert not store.finish("job-1", "cancelled")
+        job = store.get("job-1")
+        assert job.status == "completed"
+        assert job.progress == 1.0
+
+    def test_previous_incarnation_jobs_are_failed(self, tmp_path):
+        store = JobStore(str(tmp_path / "jobs.sqlite3"))
+        store.create("job-1", total_rows=10)
+
+        assert store.fail_orphaned("Interrupted by server restart") == ["job-1"]
+        job = store.get("job-1")
+        assert job.status == "failed"
+        assert job.error == "Interrupted by server restart"
+
+
+    def test_purge_finished_keeps_recent_and_unfinished_jobs(self, tmp_path):
+        store = JobStore(str(tmp_path / "jobs.sqlite3"))
+        for job_id in ("done", "running", "queued"):
+            store.create(job_id, total_rows=10)
+        store.finish("done", "completed")
+        store.mark_running("running")
+
+        now = datetime.now(timezone.utc)
+        assert store.purge_finished(now - timedelta(hours=1)) == []
+        assert store.purge_finished(now + timedelta(seconds=1)) == ["done"]
+        assert store.get("done") is None
+        assert store.get("running").status == "running"
+        assert store.get("queued").status == "queued"
+
+
+# --- Worker pool ---
+
+class TestJobService:
+    def test_shutdown_stops_running_job(self, tmp_path, large_csv):
+        service = _job_service(tmp_path)
+        job = service.submit(io.BytesIO(large_csv))
+        _wait_until_scoring(service, job.job_id)
+        service.shutdown()
+
+        deadline = time.time() + 30
+        while service.get(job.job_id).status == "running" and time.time() < deadline:
+            time.sleep(0.05)
+        job = service.get(job.job_id)
+        assert job.status == "failed"
+        assert job.error == "Interrupted by server shutdown"
+        assert job.processed_rows < job.total_rows
+
+    def test_inputs_are_removed_when_jobs_do_not_run(self, tmp_path, large_csv):
+        service = _job_service(tmp_path, max_workers=1)
+        try:
+            running = service.submit(io.BytesIO(large_csv))
+            _wait_until_scoring(service, running.job_id)
+            queued = service.submit(io.BytesIO(large_csv))
+            service.cancel(queued.job_id)
+            service.cancel(running.job_id)
+
+            queued_input = tmp_path / queued.job_id / "input.csv"
+            deadline = time.time() + 30
+            while queued_input.exists() and time.time() < deadline:
+                time.sleep(0.05)
+            assert service.get(queued.job_id).status == "cancelled"
+            assert not queued_input.exists()
+            assert not os.path.exists(tmp_path / running.job_id / "input.csv")
+        finally:
+            service.shutdown()
+
+    def test_orphaned_inputs_are_removed_on_startup(self, tmp_path):
+        store = JobStore(str(tmp_path / "jobs.sqlite3"))
+        store.create("job-1", total_rows=1)
+        (tmp_path / "job-1").mkdir()
+        (tmp_path / "job-1" / "input.csv").write_text("Type\nM\n")
+
+        service = _job_service(tmp_path)
+        assert service.get("job-1").status == "failed"
+        assert not os.path.exists(tmp_path / "job-1" / "input.csv")
+        service.shutdown()
+
+    def test_expired_jobs_are_purged(self, tmp_path):
+        store = JobStore(str(tmp_path / "jobs.sqlite3"))
+        store.create("job-1", total_rows=1)
+        store.finish("job-1", "completed")
+        (tmp_path / "job-1").mkdir()
+        (tmp_path / "job-1" / "result.csv").write_text("row\n0\n")
+        expired = (datetime.now(timezone.utc) - timedelta(hours=2)).isoformat(timespec="seconds")
+        with sqlite3.connect(tmp_path / "jobs.sqlite3") as conn:
+            conn.execute("UPDATE jobs SET finished_at = ?", (expired,))
+
+        service = _job_service(tmp_path, retention_hours=1)
+        with pytest.raises(JobNotFoundError):
+            service.get("job-1")
+        assert not os.path.exists(tmp_path / "job-1")
+        service.shutdown()
@@ -0,0 +1,92 @@
+import os
+import shutil
+
+import pytest
+
+from app.core.config import get_settings
+from app.models.ml_models import ModelManager, MODEL_FILENAME, PREPROCESSOR_FILENAME
+from app.models.model_pool import InvalidSiteError, ModelPool
+
+MODELS_DIR = get_settings().MODELS_DIR
+
+
+@pytest.fixture(scope="module")
+def default_manager():
+    manager = ModelManager(MODELS_DIR)
+    manager.load_models()
+    return manager
+
+
+@pytest.fixture
+def sites_dir(tmp_path):
+    """Three sites: two reuse the default preprocessor, one ships an identical copy."""
+    for site_id in ("plant-a", "plant-b", "plant-c"):
+        site_dir = tmp_path / site_id
+        site_dir.mkdir()
+        shutil.copy(os.path.join(MODELS_DIR, MODEL_FILENAME), site_dir / MODEL_FILENAME)
+    shutil.copy(
+        os.path.join(MODELS_DIR, PREPROCESSOR_FILENAME),
+        tmp_path / "plant-c" / PREPROCESSOR_FILENAME,
+    )
+    return tmp_path
+
+
+def _model_size():
+    return os.path.getsize(os.path.join(MODELS_DIR, MODEL_FILENAME))
+
+
+class TestModelPool:
+    def test_loads_lazily_and_caches(self, sites_dir, default_manager):
+        pool = ModelPool(str(sites_dir), default_manager, max_bytes=10 * _model_size())
+        assert pool.stats()["loaded_sites"] == []
+
+        manager = pool.get("plant-a")
+        assert manager is not default_manager
+        assert pool.get("plant-a") is manager
+        assert pool.stats()["loaded_sites"] == ["plant-a"]
+
+    def test_unknown_site_uses_default_model(self, sites_dir, default_manager):
+        pool = ModelPool(str(sites_dir), default_manager, max_bytes=10 * _model_size())
+        assert pool.get("plant-z") is default_manager
+        assert pool.get(None) is default_manager
+        assert pool.stats()["loaded_sites"] == []
+
+    def test_identical_preprocessors_are_shared(self, sites_dir, default_manager):
+        pool = ModelPool(str(sites_dir), default_manager, max_bytes=10 * _model_size())
+        managers = [pool.get(site_id) for site_id in ("plant-a", "plant-b", "plant-c")]
+
+        for manager in managers:
+            assert manager.preprocessor is default_manager.preprocessor
+        assert pool.stats()["shared_preprocessors"] == 1
+
+    def test_lru_eviction_respects_budget(self, sites_dir, default_manager):
+        pool = ModelPool(str(sites_dir), default_manager, max_bytes=int(2.5 * _model_size()))
+
+        pool.get("plant-a")
+        pool.get("plant-b")
+        pool.get("plant-a")  # plant-b is now least recently used
+        pool.get("plant-c")
+
+        stats = pool.stats()
+        assert stats["loaded_sites"] == ["plant-a", "plant-c"]
+        assert stats["used_bytes"] <= stats["max_bytes"]
+
+    def test_warns_when_site_model_shadows_default_site_threshold(self, sites_dir, caplog):
+        manager = ModelManager(MODELS_DIR)
+        manager.load_models()
+        manager.metadata.site_thresholds["plant-a"] = 0.5
+        pool = ModelPool(str(sites_dir), manager, max_bytes=10 * _model_size())
+
+        with caplog.at_level("WARNING"):
+            pool.get("plant-b")
+        assert "ignored" not in caplog.text
+
+        with caplog.at_level("WARNING"):
+            pool.get("plant-a")
+        assert "per-site threshold in the default metadata is ignored" in caplog.text
+
+    @pytest.mark.parametrize("site_id", ["../Models", "a/b", "", "bad!id"])
+    def test_rejects_invalid_site_ids(self, sites_dir, default_manager, site_id):
+        pool = ModelPool(str(sites_dir), default_manager, max_bytes=10 * _model_size())
+        with pytest.raises(InvalidSiteError):
+            pool.get(site_id)
@@ -1,5 +1,6 @@
 from dotenv import load_dotenv
 import os
+import json
 import joblib
 
 
@@ -17,3 +18,13 @@ MODELS_FOLDER_PATH = os.path.join(BASE_DIR, "Models")
 preprocessor = joblib.load(os.path.join(MODELS_FOLDER_PATH, 'preprocessor.pkl'))
 xgboost_model = joblib.load(os.path.join(MODELS_FOLDER_PATH, 'xgb_model.pkl'))
 best_threshold = 0.8966
+
+# Threshold re-derived by `python -m app.jobs.optimize_threshold`, if available.
+# A calibrated threshold only applies to calibrated probabilities, which this
+# legacy path does not produce — keep the default in that case.
+_metadata_path = os.path.join(MODELS_FOLDER_PATH, 'model_metadata.json')
+if os.path.exists(_metadata_path):
+    with open(_metadata_path, encoding='utf-8') as f:
+        _metadata = json.load(f)
+    if not _metadata.get('calibrator_file'):
+        best_threshold = _metadata.get('threshold', best_threshold)